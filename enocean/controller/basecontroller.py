@@ -72,8 +72,25 @@ class BaseController(threading.Thread):
         return True
 
     def stop(self):
+        # Only set the flag, it can be called from a signal handler
         self._stop_flag.set()
 
+    def run(self):
+        try:
+            self._run()
+        finally:
+            # Unblock receive queue consumers even if the loop raised an exception
+            self._notify_stopped()
+
+    def _run(self):
+        """Controller loop reading the EnOcean interface, implemented by subclasses"""
+        raise NotImplementedError
+
+    def _notify_stopped(self):
+        if self.__callback is None:
+            # None means no more packet will be received
+            self.receive.put(None)
+
     def parse(self):
         """Parses messages and puts them to receive queue"""
         # Loop while we get new messages
@@ -93,14 +110,21 @@ class BaseController(threading.Thread):
                     # Calculate packet header(4)+crc (2*1) = 7
                     packet_len = 7 + data_len + opt_len
                     self.logger.debug(
-                        f"Packet {packet_type} with data len {data_len} and optionnal len {opt_len}"
+                        "Packet %s with data len %s and optionnal len %s",
+                        packet_type,
+                        data_len,
+                        opt_len,
                     )
                     if packet_len > len(self._buffer):
                         self.next_sync_byte = self.next_sync_byte + packet_len + 1
                         self.logger.debug(
-                            f"Packet len {packet_len} is upper then buffer size={len(self._buffer)} "
-                            f"frame incomplete set sync byte after {self.next_sync_byte} "
-                            f"actual sync byte index={sync_byte_index}"
+                            "Packet len %s is upper then buffer size=%s "
+                            "frame incomplete set sync byte after %s "
+                            "actual sync byte index=%s",
+                            packet_len,
+                            len(self._buffer),
+                            self.next_sync_byte,
+                            sync_byte_index,
                         )
                         return ParseResult.INCOMPLETE
                     frame = self._buffer[0:packet_len]
@@ -15,30 +15,32 @@ class TCPControler(BaseController):
         self.host = host
         self.port = port
 
-    def run(self):
+    def _run(self):
         self.logger.info("TCPCommunicator started")
         sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.bind((self.host, self.port))
-        sock.listen(5)
-        sock.settimeout(0.5)
+        try:
+            sock.bind((self.host, self.port))
+            sock.listen(5)
+            sock.settimeout(0.5)
 
-        while not self._stop_flag.is_set():
-            try:
-                (client, addr) = sock.accept()
-            except socket.timeout:
-                continue
-            self.logger.debug('Client "%s" connected' % (addr))
-            client.settimeout(0.5)
-            while True and not self._stop_flag.is_set():
+            while not self._stop_flag.is_set():
                 try:
-                    data = client.recv(2048)
+                    (client, addr) = sock.accept()
                 except socket.timeout:
-                    break
-                if not data:
-                    break
-                self._buffer.extend(bytearray(data))
-            self.parse()
-            client.close()
-            self.logger.debug("Client disconnected")
-        sock.close()
-        self.logger.info("TCPCommunicator stopped")
+                    continue
+                self.logger.debug('Client "%s" connected' % (addr))
+                client.settimeout(0.5)
+                while True and not self._stop_flag.is_set():
+                    try:
+                        data = client.recv(2048)
+                    except socket.timeout:
+                        break
+                    if not data:
+                        break
+                    self._buffer.extend(bytearray(data))
+                self.parse()
+                client.close()
+                self.logger.debug("Client disconnected")
+        finally:
+            sock.close()
+            self.logger.info("TCPCommunicator stopped")
@@ -35,7 +35,7 @@ class Equipment(object):
         """interpret packet to retrieve command id from VLD packets"""
         if self.profile.commands:
             self.logger.debug(
-                f"Get command id in packet : {packet.data} {packet._bit_data}"
+                "Get command id in packet : %s %s", packet.data, packet._bit_data
             )
             command_id = self.profile.commands.parse_raw(packet._bit_data)
             return command_id if command_id else None
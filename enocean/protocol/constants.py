@@ -140,6 +140,7 @@ class FieldSetName(StrEnum):
     SHORTCUT = auto()
     TYPE = auto()
     UNIT = auto()
+    UNSUPPORTED = auto()
 
 
 # Data byte indexing
@@ -1,7 +1,12 @@
 # -*- encoding: utf-8 -*-
 import logging
+import sys
 from pathlib import Path
-from xml.etree import ElementTree
+
+try:
+    from lxml import etree as ElementTree
+except ImportError:
+    from xml.etree import ElementTree
 
 from enocean.utils import to_eep_hex_code, from_hex_string
 from enocean.protocol.constants import (
@@ -34,11 +39,13 @@ class BaseDataElt:
     " Base class inherit from every value data telegram"
 
     def __init__(self, elt):
-        self.description = elt.get("description", "")
-        self.shortcut = elt.get("shortcut")
+        # Strings repeated across profiles and used as message keys are interned
+        self.description = sys.intern(elt.get("description", ""))
+        shortcut = elt.get("shortcut")
+        self.shortcut = sys.intern(shortcut) if shortcut else shortcut
         self.offset = int(elt.get("offset")) if elt.get("offset") else None
         self.size = int(elt.get("size")) if elt.get("size") else None
-        self.unit = elt.get("unit") if elt.get("unit") else ""
+        self.unit = sys.intern(elt.get("unit") or "")
         self._raw_value = None
 
     def parse_raw(self, bitarray):
@@ -158,6 +165,8 @@ class DataEnumItem:
     def __init__(self, elt):
         self.value = parse_number_value(elt.get("value"))
         self.description = elt.get("description", "")
+        # Flag items that describe a value not supported by the device
+        self.unsupported = "not supported" in self.description
 
     def __str__(self):
         return f"Enum Item {self.description}"
@@ -168,6 +177,8 @@ class DataEnumItem:
 
 
 class DataEnumRangeItem:
+    unsupported = False
+
     def __init__(self, elt):
         self.description = elt.get("description", "")
         range = elt.find("range")
@@ -236,7 +247,7 @@ class DataEnum(BaseDataElt):
         # Find the first valid value of enum
         if not self.__first:
             min = 256
-            for i in self.items.keys():
+            for i in self.items:
                 if i < min:
                     min = i
             for i in self.range_items:
@@ -291,6 +302,7 @@ class DataEnum(BaseDataElt):
             FieldSetName.VALUE: value,
             FieldSetName.RAW_VALUE: self._raw_value,
             FieldSetName.TYPE: DataFieldType.ENUM,
+            FieldSetName.UNSUPPORTED: item.unsupported,
         }
 
     def set_value(self, val, bitarray):
@@ -302,7 +314,7 @@ class DataEnum(BaseDataElt):
             value = item.value
         if not item:
             raise ValueError(f"Unable to find enum for {val}, might be out of Range")
-        self.logger.debug(f"Set value to {value}")
+        self.logger.debug("Set value to %s", value)
         return self._set_raw(int(value), bitarray)
 
     def __str__(self) -> str:
@@ -332,7 +344,8 @@ class ProfileData:
         self._unit_fields = list()
         self._availability_fields = list()
 
-        for e in elt.iter():
+        # Data fields are direct children, skip walking their range/scale/item nodes
+        for e in elt:
             if e.tag == "status":
                 d = DataStatus(e)
             elif e.tag == "value":
@@ -360,7 +373,7 @@ class ProfileData:
         """
         return: BaseDataElt
         """
-        self.logger.debug(f"Get profile data for shortcut {shortcut}")
+        self.logger.debug("Get profile data for shortcut %s", shortcut)
         for item in self.items:
             if item.shortcut == shortcut:
                 return item
@@ -509,11 +522,11 @@ class Message:
                     factor = 1 / float(operator[FieldSetName.VALUE])
                 elif operator[FieldSetName.SHORTCUT] == SpecificShortcut.MULTIPLIER:
                     factor = float(operator[FieldSetName.VALUE])
-                self.logger.debug(f"Defined factor for profile data is {factor}")
+                self.logger.debug("Defined factor for profile data is %s", factor)
             if unit_item:
                 u = unit_item.parse(bitarray, status)
                 unit = u.get("value", "")
-                self.logger.debug(f"Defined unit for profile data is {unit}")
+                self.logger.debug("Defined unit for profile data is %s", unit)
             for v_i in values_item:
                 bypass_list.append(v_i)
                 v_i.unit = unit
@@ -527,7 +540,7 @@ class Message:
                 for flag in self.profile_data.availability_fields:
                     availability_flag = flag.parse(bitarray, status)
                     self.logger.debug(
-                        f"Field availability flags to process {availability_flag}"
+                        "Field availability flags to process %s", availability_flag
                     )
                     if metric_shortcut := AVAILABILITY_FIELD_MAPPING.get(
                         availability_flag[FieldSetName.SHORTCUT]
@@ -539,7 +552,7 @@ class Message:
                                 if v.shortcut == metric_shortcut
                             ]
                             self.logger.debug(
-                                f"Found value field to disable: {metric_field}"
+                                "Found value field to disable: %s", metric_field
                             )
                             bypass_list.append(metric_field[0])
                             bypass_list.append(flag)
@@ -551,7 +564,7 @@ class Message:
         for source in self.items:
             # Manage to get the command related value as define in profile
             if source in bypass_list:
-                self.logger.debug(f"Bypass {source} this it has already been handled")
+                self.logger.debug("Bypass %s this it has already been handled", source)
                 continue
             if source.shortcut == "CMD":
                 output.append(
@@ -571,7 +584,9 @@ class Message:
         """Update data based on data contained in properties
         profile: Profile packet._bit_data, packet._bit_status
         """
-        self.logger.debug(f"Set value for properties={values} to {self.profile_data}")
+        self.logger.debug(
+            "Set value for properties=%s to %s", values, self.profile_data
+        )
         # self.logger.debug(f"Profile with selected command {self.profile.command_item} {self.profile.command_data}")
 
         for shortcut, value in values.items():
@@ -601,23 +616,28 @@ class EepLibraryLoader:
 
     @staticmethod
     def load_xml(file_path):
-        tree = ElementTree.parse(file_path)
-        tree_root = tree.getroot()
-        # TODO: Use map() here
-        return {
-            from_hex_string(telegram.attrib["rorg"]): {
-                from_hex_string(function.attrib["func"]): {
-                    from_hex_string(profile.attrib["type"]): Profile(
-                        profile,
-                        rorg=from_hex_string(telegram.attrib["rorg"]),
-                        func=from_hex_string(function.attrib["func"]),
-                    )
-                    for profile in function.findall("profile")
-                }
-                for function in telegram.findall("profiles")
-            }
-            for telegram in tree_root.findall("telegram")
-        }
+        profiles = dict()
+        rorg = func = None
+        # Keep reference to the dict of current telegram and function profiles
+        rorg_profiles = func_profiles = None
+        # Stream the file and release each profile element once parsed
+        for event, elt in ElementTree.iterparse(
+            str(file_path), events=("start", "end")
+        ):
+            if event == "start":
+                # Attributes are already set on start event
+                if elt.tag == "telegram":
+                    rorg = from_hex_string(elt.attrib["rorg"])
+                    rorg_profiles = profiles.setdefault(rorg, dict())
+                elif elt.tag == "profiles":
+                    func = from_hex_string(elt.attrib["func"])
+                    func_profiles = rorg_profiles.setdefault(func, dict())
+            elif elt.tag == "profile":
+                func_profiles[from_hex_string(elt.attrib["type"])] = Profile(
+                    elt, rorg=rorg, func=func
+                )
+                elt.clear()
+        return profiles
 
 
 class EepLibrary:
@@ -50,7 +50,8 @@ class Packet(object):
 
         if optional is None:
             self.logger.debug(
-                f"Replacing Packet.optional with default value, for packet type {self.packet_type}"
+                "Replacing Packet.optional with default value, for packet type %s",
+                self.packet_type,
             )
             self.optional = []
         else:
@@ -164,7 +165,7 @@ class Packet(object):
             packet = EventPacket(packet_type, data, opt_data)
         else:
             packet = Packet(packet_type, data, opt_data)
-        Packet.logger.debug(f"Successfully parsed packet {packet}")
+        Packet.logger.debug("Successfully parsed packet %s", packet)
         return ParseResult.OK, packet
 
     @staticmethod
@@ -185,7 +186,7 @@ class Packet(object):
         learn=False,
         **kwargs,
     ):
-        Packet.logger.debug(f"Create packet for equipment profile {equipment.profile}")
+        Packet.logger.debug("Create packet for equipment profile %s", equipment.profile)
         if packet_type != PacketType.RADIO:
             raise NotImplementedError("Packet type not supported by this function.")
 
@@ -223,12 +224,12 @@ class Packet(object):
             packet.data.extend([0, 0, 0, 0])
         else:  # For VLD extend the data variable len
             Packet.logger.debug(
-                f"Extend the size of packet by {packet.message.data_length} bits"
+                "Extend the size of packet by %s bits", packet.message.data_length
             )
             packet.data.extend([0] * int(packet.message.data_length))
         packet.data.extend(sender)
         packet.data.extend([0])  # Add status byte
-        Packet.logger.debug(f"Data length {len(packet.data)}")
+        Packet.logger.debug("Data length %s", len(packet.data))
         # Always use sub-telegram 3, maximum dbm (as per spec, when sending),
         # and no security (security not supported as per EnOcean Serial Protocol).
         # p18 ESP3: SubTelNum + Destination ID + dBm + Security level
@@ -240,7 +241,7 @@ class Packet(object):
             if packet.rorg == RORG.BS4:
                 packet.data[4] |= 1 << 3
         packet.data[-1] = packet.status
-        Packet.logger.debug(f"Packet data length {len(packet.data)} after set_eep")
+        Packet.logger.debug("Packet data length %s after set_eep", len(packet.data))
         return packet
 
     def parse(self):
@@ -260,7 +261,7 @@ class Packet(object):
         # set EEP profile, if demanded
         # parse data
         values = message.get_values(self._bit_data, self._bit_status)
-        self.logger.debug(f"Parsed data values {values}")
+        self.logger.debug("Parsed data values %s", values)
         return values
 
     def build(self):
@@ -310,7 +311,7 @@ class RadioPacket(Packet):
         learn=False,
         **kwargs,
     ):
-        Packet.logger.debug(f"Create message RadioPacket for rorg {equipment.rorg}")
+        Packet.logger.debug("Create message RadioPacket for rorg %s", equipment.rorg)
         return Packet.create_message(
             PacketType.RADIO,
             equipment,
@@ -19,6 +19,21 @@ conf = {
 
 
 class ConfigManager:
+    # Equipment keys converted to bool when config is loaded
+    EQUIPMENT_BOOLEAN_KEYS = (
+        "publish_raw",
+        "publish_flat",
+        "publish_flat_changes",
+        "publish_rssi",
+        "use_key_shortcut",
+        "persistent",
+        "log_learn",
+        "ignore",
+    )
+    # Accepted values of equipment boolean keys, others keep the equipment default
+    BOOLEAN_TRUE_VALUES = frozenset(("true", "yes", "1"))
+    BOOLEAN_FALSE_VALUES = frozenset(("false", "no", "0"))
+
     def __init__(self, conf):
         self._conf = conf
         self.logging_level = logging.DEBUG if self._conf.get("debug") else logging.INFO
@@ -76,6 +91,20 @@ class ConfigManager:
                             # new_sens[key] = config_parser[section][key]
                             if key in ("address", "rorg", "func", "type"):
                                 new_sens[key] = int(config_parser[section][key], 16)
+                            elif key in self.EQUIPMENT_BOOLEAN_KEYS:
+                                value = config_parser[section][key].lower()
+                                if value in self.BOOLEAN_TRUE_VALUES:
+                                    new_sens[key] = True
+                                elif value in self.BOOLEAN_FALSE_VALUES:
+                                    new_sens[key] = False
+                                else:
+                                    logger.warning(
+                                        "Invalid boolean value %s for %s of %s, "
+                                        "using default",
+                                        config_parser[section][key],
+                                        key,
+                                        section,
+                                    )
                             else:
                                 new_sens[key] = config_parser[section][key]
                         except KeyError:
@@ -1,65 +1,137 @@
 import logging
+from functools import cached_property
 
 import enocean.utils
 from enocean.equipment import Equipment as EnoceanEquipment
+from enocean.protocol.constants import FieldSetName
 
 
 class Equipment(EnoceanEquipment):
     logger = logging.getLogger("enocean.mqtt.equipment")
 
+    # Parent class keeps a __dict__ (also needed by cached_property definition)
+    __slots__ = (
+        "publish_raw",
+        "publish_flat",
+        "publish_flat_changes",
+        "publish_rssi",
+        "use_key_shortcut",
+        "retain",
+        "log_learn",
+        "ignore",
+        "answer",
+        "command",
+        "channel",
+        "direction",
+        "sender",
+        "sender_bytes",
+        "default_data",
+        "default_data_bytes",
+        "fmt_keys",
+        "topic",
+        "flat_topics",
+        "flat_values",
+        "flat_meta_published",
+        "flat_unit_values",
+        "channel_topics",
+        "publishers",
+        "_address_label",
+    )
+
     def __init__(self, **kwargs):
         address = kwargs["address"]
         rorg = int(kwargs.get("rorg"))
         func = int(kwargs.get("func"))
-        type_ = int(kwargs.get("type"))
+        type_ = int(kwargs.get("type", 0))
         name = kwargs.get("name")
         topic_prefix = kwargs.get("topic_prefix")
         if topic_prefix and name.startswith(topic_prefix):
-            name = name.replace(topic_prefix, "")
+            name = name[len(topic_prefix) :]
         # self.logger.debug(f"Lookup profile for {rorg} {func} {type_}")
         super().__init__(address=address, rorg=rorg, func=func, type_=type_, name=name)
-        self.publish_raw = self.get_config_boolean(kwargs, "publish_raw", default=False)
-        self.publish_flat = self.get_config_boolean(
-            kwargs, "publish_flat", default=False
-        )
-        self.publish_rssi = self.get_config_boolean(
-            kwargs, "publish_rssi", default=True
-        )
-        self.use_key_shortcut = self.get_config_boolean(
-            kwargs, "use_key_shortcut", default=False
-        )
-        self.retain = self.get_config_boolean(kwargs, "persistent", default=False)
-        self.log_learn = self.get_config_boolean(kwargs, "log_learn", default=False)
-        self.ignore = self.get_config_boolean(kwargs, "ignore", default=False)
+        self._address_label = enocean.utils.to_hex_string(address)
+        # Boolean keys are converted by the config manager when config is loaded
+        self.publish_raw = kwargs.get("publish_raw", False)
+        self.publish_flat = kwargs.get("publish_flat", False)
+        self.publish_flat_changes = kwargs.get("publish_flat_changes", False)
+        self.publish_rssi = kwargs.get("publish_rssi", True)
+        self.use_key_shortcut = kwargs.get("use_key_shortcut", False)
+        self.retain = kwargs.get("persistent", False)
+        self.log_learn = kwargs.get("log_learn", False)
+        self.ignore = kwargs.get("ignore", False)
         self.answer = kwargs.get("answer")
         self.command = kwargs.get("command", "CMD")
         self.channel = kwargs.get("channel")
         self.direction = kwargs.get("direction")
+        # Keep configured sender as is, it is published in the equipment definition
         self.sender = kwargs.get("sender")
+        # Convert sender address once to the bytes list used to build packets
+        sender = self.sender
+        if isinstance(sender, str):
+            sender = int(sender, 16)
+        self.sender_bytes = (
+            enocean.utils.address_to_bytes_list(sender) if sender else None
+        )
         self.default_data = kwargs.get("default_data")
+        # Decode default data once to avoid converting it on each packet sent
+        if isinstance(self.default_data, str):
+            self.default_data = int(self.default_data, 16)
+        self.default_data_bytes = (
+            self.default_data.to_bytes(4, "big")
+            if self.default_data is not None
+            else None
+        )
+        # Define the key that should be used in field to compose json message
+        if self.publish_raw or kwargs.get("default_publish_raw"):
+            # Message format must be published as raw (<shortcut>: <raw_value>)
+            self.fmt_keys = (FieldSetName.SHORTCUT, FieldSetName.RAW_VALUE)
+        elif self.use_key_shortcut or kwargs.get("default_use_key_shortcut"):
+            # Message format must be published with field shortcut (<shortcut>: <value>)
+            self.fmt_keys = (FieldSetName.SHORTCUT, FieldSetName.VALUE)
+        else:
+            # Message format must be published with field description (<description>: <value>) /!\ Might be verbose
+            self.fmt_keys = (FieldSetName.DESCRIPTION, FieldSetName.VALUE)
         # self.data = dict()
         # Allow to specify a topic different from name to allow blank
         if topic := kwargs.get("topic"):
             self.topic = f"{topic_prefix}{topic}"
         else:
             self.topic = f"{topic_prefix}{name}"
+        # Cache of flat publish topics indexed by (message topic, property name)
+        self.flat_topics = dict()
+        # Last flat published values, used to publish only changed values (reset on
+        # MQTT connection)
+        self.flat_values = dict() if self.publish_flat_changes else None
+        # Rorg flat topics published once, reset on MQTT connection
+        self.flat_meta_published = set()
+        # Last published flat unit values, units are only published when changed
+        self.flat_unit_values = dict()
+        # Cache of channel sub topics indexed by channel value
+        self.channel_topics = dict()
+        # Functions used to publish decoded messages, bound by the gateway
+        self.publishers = tuple()
 
-    @staticmethod
-    def get_config_boolean(c, key, default=False):
-        if default:
-            return False if c.get(key, True) in ("false", "False", "0", 0) else True
-        else:
-            return True if c.get(key, False) in ("true", "True", "1", 1) else False
+    def reset_published_values(self):
+        """Forget values published once, so that they are published again"""
+        self.flat_meta_published.clear()
+        self.flat_unit_values.clear()
+        if self.flat_values is not None:
+            self.flat_values.clear()
 
     @property
+    def address_label(self):
+        return self._address_label
+
+    @cached_property
     def definition(self):
+        # Cached since none of the fields change once the equipment is set up
         return dict(
             eep=self.eep_code,
             rorg=self.rorg,
             func=self.func,
             type=self.type,
             description=self.description,
-            address=enocean.utils.to_hex_string(self.address),
+            address=self.address_label,
             topic=self.topic,
             config=dict(
                 publish_rssi=self.publish_rssi,
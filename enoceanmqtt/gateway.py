@@ -4,7 +4,10 @@
 import logging
 import queue
 import json
+from collections import deque
 import platform
+import signal
+import threading
 import time
 
 from enocean.controller.serialcontroller import SerialController
@@ -12,14 +15,33 @@ from enocean.protocol.packet import RadioPacket
 from enocean.protocol.constants import (
     PacketType,
     ReturnCode,
-    DataFieldType,
-    SpecificShortcut,
+    EventCode,
     FieldSetName,
 )
 from equipment import Equipment
 import enocean.utils
 import paho.mqtt.client as mqtt
 
+try:
+    # orjson is optional, it is faster and serializes directly to bytes
+    import orjson
+
+    def json_dumps(obj):
+        # Message keys can be StrEnum members (ex: command shortcut), rejected by
+        # orjson unless non str keys are allowed
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+    json_loads = orjson.loads
+except ImportError:
+    json_dumps = json.dumps
+    json_loads = json.loads
+
+
+# Values considered as True for a boolean config key
+TRUE_CONFIG_VALUES = frozenset(("true", "True", "1", 1, True))
+# Marker of an address not yet received by the gateway
+_SENTINEL = object()
+
 
 class Gateway:
     """the main working class providing the MQTT interface to the enocean packet classes"""
@@ -32,23 +54,44 @@ class Gateway:
     ADAPTER_DETAILS_TOPIC = f"{GATEWAY_TOPIC}/adapter"
     GATEWAY_STATUS_TOPIC = f"{GATEWAY_TOPIC}/status"
     GATEWAY_EQUIPMENTS_TOPIC = f"{GATEWAY_TOPIC}/equipments"
+    EQUIPMENT_REQUEST_TOPIC_SUFFIX = "/req"
     # Use underscore so that it is unique and doesn't match a potential future EnOcean EEP field.
     TIMESTAMP_MESSAGE_KEY = "_timestamp"
     RSSI_MESSAGE_KEY = "_rssi"
     CHANNEL_MESSAGE_KEY = "_channel"
     RORG_MESSAGE_KEY = "_rorg"
+    UNIT_MESSAGE_KEY_SUFFIX = "|unit"
+    # Payload as bytes to avoid paho encoding it on publish
+    ONLINE_PAYLOAD = b"ONLINE"
+    OFFLINE_PAYLOAD = b"OFFLINE"
+    # Maximum number of received addresses remembered by the gateway
+    MAX_DETECTED_EQUIPMENTS = 4096
+    # Number of buffered messages that triggers a publish flush in the run loop
+    PUBLISH_BATCH_SIZE = 32
+    # Maximum number of received packets handled in one batch of the run loop
+    RECEIVE_BATCH_SIZE = 32
+    # Global config keys that are normalized to real bool once at init
+    BOOLEAN_CONFIG_KEYS = (
+        "publish_raw",
+        "publish_internal",
+        "publish_response_status",
+        "mqtt_ssl",
+        "mqtt_ssl_insecure",
+        "mqtt_debug",
+        "log_packets",
+    )
 
     logger = logging.getLogger("enocean.mqtt.communicator")
 
     def __init__(self, config):
         self.conf_manager = config
         self.conf = self.conf_manager.global_config
+        for key in self.BOOLEAN_CONFIG_KEYS:
+            self.conf[key] = self.get_config_boolean(key)
         self.publish_timestamp = self.conf.get("publish_timestamp", True)
-        self.publish_raw = self.get_config_boolean("publish_raw")
-        self.publish_internal = self.get_config_boolean("publish_internal")
-        self.publish_response_status = self.get_config_boolean(
-            "publish_response_status"
-        )
+        self.publish_raw = self.conf["publish_raw"]
+        self.publish_internal = self.conf["publish_internal"]
+        self.publish_response_status = self.conf["publish_response_status"]
         self.use_key_shortcut = self.conf.get("use_key_shortcut")
         if topic_prefix := self.conf.get("mqtt_prefix"):
             if not topic_prefix.endswith("/"):
@@ -56,14 +99,36 @@ class Gateway:
         else:
             topic_prefix = ""
         self.topic_prefix = topic_prefix
+        # Topics that don't depend on received messages are built once
+        self._status_topic = f"{topic_prefix}{self.GATEWAY_STATUS_TOPIC}"
+        self._teach_in_topic = f"{topic_prefix}{self.TEACH_IN_TOPIC}"
+        self._equipments_topic = f"{topic_prefix}{self.GATEWAY_EQUIPMENTS_TOPIC}"
+        self._adapter_topic = f"{topic_prefix}{self.ADAPTER_DETAILS_TOPIC}"
+        self._req_topic = f"{topic_prefix}req"
+        self._learn_topic = f"{topic_prefix}learn"
+        self._reload_topic = f"{topic_prefix}reload"
+        self._rep_topic = f"{topic_prefix}rep"
+        # Handler of gateway command topics, other messages are handled as json
+        self._topic_handlers = {
+            self._learn_topic: self.handle_learn_activation_request,
+            self._reload_topic: self.handle_reload_equipments_request,
+        }
+        # Messages published from the run loop, flushed by batch or when idle
+        self._pending_publish = deque()
+        # Unit message keys indexed by property key, built once per property
+        self._unit_keys = dict()
         self.logger.info(
             f"Init communicator with sensors: {self.conf_manager.sensors}, publish timestamp: {self.publish_timestamp}"
         )
         self.equipments = dict()
         # Set self.equipments based on sensors present in config_manager
         self.setup_devices_list()
-        # Define set() of detected address received by the gateway
-        self.detected_equipments = set()
+        # Handler of received enocean packet by packet type
+        self._packet_handlers = {
+            PacketType.RADIO: self._process_radio_packet,
+            PacketType.RESPONSE: self._process_response_packet,
+            PacketType.EVENT: self._process_event_packet,
+        }
 
         # check for mandatory configuration
         if "mqtt_host" not in self.conf or "enocean_port" not in self.conf:
@@ -95,7 +160,7 @@ class Gateway:
             self.mqtt_client.username_pw_set(
                 self.conf["mqtt_user"], self.conf["mqtt_pwd"]
             )
-        if self.get_config_boolean("mqtt_ssl"):
+        if self.conf["mqtt_ssl"]:
             self.logger.info("enabling SSL")
             ca_certs = (
                 self.conf["mqtt_ssl_ca_certs"]
@@ -115,19 +180,35 @@ class Gateway:
             self.mqtt_client.tls_set(
                 ca_certs=ca_certs, certfile=certfile, keyfile=keyfile
             )
-            if self.get_config_boolean("mqtt_ssl_insecure"):
+            if self.conf["mqtt_ssl_insecure"]:
                 self.logger.warning("disabling SSL certificate verification")
                 self.mqtt_client.tls_insecure_set(True)
-        if self.get_config_boolean("mqtt_debug"):
+        if self.conf["mqtt_debug"]:
             self.mqtt_client.enable_logger()
-        self.log_packets = self.get_config_boolean("log_packets")
+        self.log_packets = self.conf["log_packets"]
         self.logger.debug(
             f"connecting to host {self.conf['mqtt_host']}, port {mqtt_port}, keepalive {mqtt_keepalive}"
         )
         self.mqtt_qos = int(self.conf["mqtt_qos"]) if self.conf.get("mqtt_qos") else 0
+        if self.conf.get("mqtt_max_inflight"):
+            # Allow more QoS>0 messages in flight to sustain packet bursts
+            self.mqtt_client.max_inflight_messages_set(
+                int(self.conf["mqtt_max_inflight"])
+            )
+        if self.publish_internal:
+            # Let the broker publish status if connection is lost without cleanup
+            self.mqtt_client.will_set(
+                self._status_topic, self.OFFLINE_PAYLOAD, qos=1, retain=True
+            )
         self.mqtt_client.connect_async(
             self.conf["mqtt_host"], port=mqtt_port, keepalive=mqtt_keepalive
         )
+        # MQTT messages are handled out of paho network loop by a worker thread
+        self._mqtt_inbound = queue.SimpleQueue()
+        self._mqtt_worker_thread = threading.Thread(
+            target=self._mqtt_worker, name="mqtt-worker", daemon=True
+        )
+        self._mqtt_worker_thread.start()
         self.mqtt_client.loop_start()
 
     def __del__(self):
@@ -135,47 +216,56 @@ class Gateway:
             self.enocean.stop()
 
     def get_config_boolean(self, key):
-        return (
-            True
-            if self.conf.get(key, False) in ("true", "True", "1", 1, True)
-            else False
-        )
+        return self.conf.get(key, False) in TRUE_CONFIG_VALUES
 
     def setup_devices_list(self, force=False):
         equipments_list = dict()
+        topic_to_equipment = dict()
+        equipments_by_name = dict()
         if force:
             self.conf_manager.load_config_file(omit_global=True)
         for s in self.conf_manager.sensors:
             address = s.get("address")
             try:
                 s["topic_prefix"] = self.topic_prefix
+                s["default_publish_raw"] = self.publish_raw
+                s["default_use_key_shortcut"] = self.use_key_shortcut
                 equipment = Equipment(**s)
+                # Bind publish functions once since equipment config doesn't change
+                equipment.publishers = (self._publish_mqtt_json,)
+                if equipment.publish_flat:
+                    equipment.publishers += (self._publish_mqtt_flat,)
                 equipments_list[address] = equipment
-            except NotImplementedError:
+                topic_to_equipment[
+                    equipment.topic + self.EQUIPMENT_REQUEST_TOPIC_SUFFIX
+                ] = equipment
+                equipments_by_name[equipment.name] = equipment
+            except (NotImplementedError, ValueError):
+                # Unsupported EEP or invalid hex value (sender, default_data)
                 self.logger.warning(f"Unable to setup device {address}")
         self.equipments = equipments_list
+        # Index equipments by request topic to find them without scanning the list
+        self._topic_to_equipment = topic_to_equipment
+        self._equipments_by_name = equipments_by_name
+        self._equipments_definitions = [
+            equipment.definition for equipment in equipments_list.values()
+        ]
+        # Received addresses (ordered) with their equipment, None if not configured
+        self._known_state = dict()
 
     def get_equipment_by_topic(self, topic):
-        for equipment in self.equipments.values():
-            if f"{equipment.topic}/" in topic:
-                return equipment
+        return self._topic_to_equipment.get(topic)
 
     def get_equipment(self, id):
         """Try to get the equipment based on id (can be address or name)"""
-        if equipment := self.equipments.get(id):
+        if equipment := self.equipments.get(id) or self._equipments_by_name.get(id):
             return equipment
-        for equipment in self.equipments.values():
-            if id == equipment.name:
-                return equipment
-        self.logger.warning(f"Unable to find equipment with key {id}")
+        self.logger.warning("Unable to find equipment with key %s", id)
 
     @property
     def equipments_definition_list(self):
-        equipments_definition_list = list()
-        # listen to enocean send requests
-        for equipment in self.equipments.values():
-            equipments_definition_list.append(equipment.definition)
-        return equipments_definition_list
+        # Built along with equipments list in setup_devices_list
+        return self._equipments_definitions
 
     # =============================================================================================
     # MQTT CLIENT
@@ -184,29 +274,45 @@ class Gateway:
     def mqtt_publish(self, topic, payload, retain=False, qos=0):
         # Helper that publish mqtt message using global config and handling dict as json
         qos = qos or self.mqtt_qos
-        if isinstance(payload, dict) or isinstance(payload, list):
-            payload = json.dumps(payload)
+        if isinstance(payload, (dict, list)):
+            payload = json_dumps(payload)
         self.mqtt_client.publish(topic, payload, retain=retain, qos=qos)
 
+    def mqtt_publish_buffered(self, topic, payload, retain=False, qos=0):
+        # Buffer message to publish it with the next batch of the run loop
+        self._pending_publish.append((topic, payload, retain, qos))
+        if len(self._pending_publish) >= self.PUBLISH_BATCH_SIZE:
+            self.flush_mqtt_publish()
+
+    def flush_mqtt_publish(self):
+        pending = self._pending_publish
+        while pending:
+            self.mqtt_publish(*pending.popleft())
+
     def _on_connect(self, mqtt_client, userdata, flags, reason_code, properties):
         if reason_code == 0:
             self.logger.info("successfully connected to MQTT broker.")
-            self.logger.debug(f"subscribe to root req topic: {self.topic_prefix}req")
-            mqtt_client.subscribe(f"{self.topic_prefix}req")
-            mqtt_client.subscribe(f"{self.topic_prefix}learn")
-            mqtt_client.subscribe(f"{self.topic_prefix}reload")
+            self.logger.debug("subscribe to root req topic: %s", self._req_topic)
+            # Group subscriptions so that they are sent in a single SUBSCRIBE packet
+            topics = [
+                (self._req_topic, self.mqtt_qos),
+                (self._learn_topic, self.mqtt_qos),
+                (self._reload_topic, self.mqtt_qos),
+            ]
             if self.publish_internal:
-                self.mqtt_publish(
-                    f"{self.topic_prefix}{self.GATEWAY_STATUS_TOPIC}",
-                    "ONLINE",
-                    retain=True,
-                )
                 # listen to enocean send requests
-                for equipment in self.equipments.values():
-                    # logging.debug("MQTT subscribing: %s", cur_sensor['name']+'/req/#')
-                    mqtt_client.subscribe(equipment.topic + "/req")
+                topics.extend(
+                    (topic, self.mqtt_qos) for topic in self._topic_to_equipment
+                )
+            mqtt_client.subscribe(topics)
+            # Values published once or only on change might have been dropped while
+            # disconnected
+            for equipment in self.equipments.values():
+                equipment.reset_published_values()
+            if self.publish_internal:
+                self.mqtt_publish(self._status_topic, self.ONLINE_PAYLOAD, retain=True)
                 self.mqtt_publish(
-                    f"{self.topic_prefix}{self.GATEWAY_EQUIPMENTS_TOPIC}",
+                    self._equipments_topic,
                     self.equipments_definition_list,
                     retain=True,
                 )
@@ -231,16 +337,12 @@ class Gateway:
             time.sleep(0.1)
         try:
             teach_in = "ON" if self.enocean.teach_in else "OFF"
-            self.mqtt_publish(
-                f"{self.topic_prefix}{self.TEACH_IN_TOPIC}", teach_in, retain=True
-            )
+            self.mqtt_publish(self._teach_in_topic, teach_in, retain=True)
             payload = self.controller_info
             payload["address"] = enocean.utils.to_hex_string(
                 self.controller_address
             )  # Set it back
-            self.mqtt_publish(
-                f"{self.topic_prefix}{self.ADAPTER_DETAILS_TOPIC}", payload, retain=True
-            )
+            self.mqtt_publish(self._adapter_topic, payload, retain=True)
         except Exception:
             self.logger.exception(Exception)
 
@@ -254,54 +356,70 @@ class Gateway:
             )
 
     def _on_mqtt_message(self, mqtt_client, userdata, msg):
+        # Hand over message to worker thread to not block paho network loop
+        self._mqtt_inbound.put(msg)
+
+    def _mqtt_worker(self):
+        """Handle received MQTT messages until None is received"""
+        while (msg := self._mqtt_inbound.get()) is not None:
+            try:
+                self._process_mqtt_message(msg)
+            except Exception as e:
+                self.logger.exception(e)
+
+    def _process_mqtt_message(self, msg):
         # search for sensor
         self.logger.info("received MQTT message: %s", msg.topic)
-        if msg.topic == f"{self.topic_prefix}learn":
-            self.handle_learn_activation_request(msg)
-        elif msg.topic == f"{self.topic_prefix}reload":
-            self.logger.info("Reload equipments list")
-            self.setup_devices_list(force=True)
-            self.mqtt_publish(
-                f"{self.topic_prefix}{self.GATEWAY_EQUIPMENTS_TOPIC}",
-                self.equipments_definition_list,
-                retain=True,
-            )
-            self.logger.debug(f"New equipments list {self.equipments}")
+        if handler := self._topic_handlers.get(msg.topic):
+            handler(msg)
         else:
             # Get how to handle MQTT message
             try:
-                mqtt_payload = json.loads(msg.payload)
+                mqtt_payload = json_loads(msg.payload)
                 try:
                     self._mqtt_message_json(msg.topic, mqtt_payload)
                 except Exception as e:
                     self.logger.warning(
-                        f"unexpected or erroneous MQTT message: {msg.topic}: {msg.payload}"
+                        "unexpected or erroneous MQTT message: %s: %s",
+                        msg.topic,
+                        msg.payload,
                     )
                     self.logger.exception(e)
 
             except json.decoder.JSONDecodeError:
                 self.logger.warning(
-                    f"Received message payload is not json type: {msg.payload}"
+                    "Received message payload is not json type: %s", msg.payload
                 )
             except Exception:
-                self.logger.error(f"unable to send {msg}")
+                self.logger.error("unable to send %s", msg)
                 self.logger.exception(Exception)
 
+    def handle_reload_equipments_request(self, msg):
+        self.logger.info("Reload equipments list")
+        self.setup_devices_list(force=True)
+        self.mqtt_publish(
+            self._equipments_topic,
+            self.equipments_definition_list,
+            retain=True,
+        )
+        self.logger.debug("New equipments list %s", self.equipments)
+
     def handle_learn_activation_request(self, msg):
-        command = msg.payload.decode("utf-8").upper()
-        if command == "ON":
+        # Compare payload as bytes, no need to decode it for fixed commands
+        payload = msg.payload.upper()
+        if payload == b"ON":
+            command = "ON"
             self.enocean.teach_in = True
             self.logger.info("gateway teach in mode enabled")
-        elif command == "OFF":
+        elif payload == b"OFF":
+            command = "OFF"
             self.enocean.teach_in = False
             self.logger.info("gateway teach in mode disabled ")
         else:
-            self.logger.warning(f"not supported command: {command} for learn")
+            self.logger.warning("not supported command: %r for learn", msg.payload)
             return
         if self.publish_internal:
-            self.mqtt_publish(
-                f"{self.topic_prefix}{self.TEACH_IN_TOPIC}", command, retain=True
-            )
+            self.mqtt_publish(self._teach_in_topic, command, retain=True)
 
     # =============================================================================================
     # MQTT TO ENOCEAN
@@ -320,22 +438,26 @@ class Gateway:
                 ]  # Remove key to avoid to have it during for loop
             except KeyError:
                 self.logger.warning(
-                    f"unable to get equipment topic={mqtt_topic} payload={mqtt_json_payload}"
+                    "unable to get equipment topic=%s payload=%s",
+                    mqtt_topic,
+                    mqtt_json_payload,
                 )
                 return None
-        self.logger.debug(f"found {equipment} for message in {mqtt_topic}")
+        self.logger.debug("found %s for message in %s", equipment, mqtt_topic)
         try:
             # JSON payload shall be sent to '/req' topic
-            if mqtt_topic.endswith("/req"):
+            if mqtt_topic.endswith(self.EQUIPMENT_REQUEST_TOPIC_SUFFIX):
                 self._handle_mqtt_message(equipment, mqtt_json_payload)
         except AttributeError:
             self.logger.warning(
-                f"unable to handle message topic={mqtt_topic} payload={mqtt_json_payload}"
+                "unable to handle message topic=%s payload=%s",
+                mqtt_topic,
+                mqtt_json_payload,
             )
 
     def _handle_mqtt_message(self, equipment, payload):
         # Send received MQTT message to EnOcean.
-        self.logger.debug(f"Message {payload} to send to {equipment.address}")
+        self.logger.debug("Message %s to send to %s", payload, equipment.address)
         # Check MQTT message has valid data
         if not payload:
             self.logger.warning("no data to send from MQTT message!")
@@ -347,12 +469,13 @@ class Gateway:
         if command_shortcut:
             # Check MQTT message sets the command field and set the command id
             if command_id := payload.get(command_shortcut):
-                self.logger.debug(
-                    f"retrieved command id from MQTT message: {hex(command_id)}"
-                )
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug(
+                        "retrieved command id from MQTT message: %s", hex(command_id)
+                    )
             else:
                 self.logger.warning(
-                    f"command field {command_shortcut} must be set in MQTT message!"
+                    "command field %s must be set in MQTT message!", command_shortcut
                 )
                 return
         self._send_packet_to_esp(equipment, data=payload, command=command_id)
@@ -362,27 +485,64 @@ class Gateway:
     # ENOCEAN TO MQTT
     # =============================================================================================
 
+    def _publish_mqtt_json(self, equipment, topic, mqtt_json):
+        """Publish decoded packet content as json message"""
+        self.logger.debug("%s: Sent MQTT: %s", topic, mqtt_json)
+        self.mqtt_publish_buffered(topic, mqtt_json, retain=equipment.retain)
+
+    def _publish_mqtt_flat(self, equipment, topic, mqtt_json):
+        """Publish each decoded packet field in its own topic"""
+        publish = self.mqtt_publish_buffered
+        retain = equipment.retain
+        flat_topics = equipment.flat_topics
+        # Last published value by topic, only set if publishing changes only
+        flat_values = equipment.flat_values
+        # Rorg topics already published since connection
+        flat_meta_published = equipment.flat_meta_published
+        # Last published unit by topic, units are decoded from each telegram
+        flat_unit_values = equipment.flat_unit_values
+        for prop_name, value in mqtt_json.items():
+            if (topic, prop_name) in flat_meta_published:
+                continue
+            # Build the property topic once and reuse it for next messages
+            if (flat_topic := flat_topics.get((topic, prop_name))) is None:
+                # Avoid sub topic if property has / ex: "I/O"
+                flat_topic = "/".join((topic, prop_name.replace("/", "")))
+                flat_topics[(topic, prop_name)] = flat_topic
+            if prop_name == self.RORG_MESSAGE_KEY:
+                # Value never changes, publish it once per connection
+                flat_meta_published.add((topic, prop_name))
+                publish(flat_topic, value, retain=retain)
+                continue
+            if prop_name.endswith(self.UNIT_MESSAGE_KEY_SUFFIX):
+                # Publish unit only when it changed
+                if flat_unit_values.get(flat_topic) != value:
+                    flat_unit_values[flat_topic] = value
+                    publish(flat_topic, value, retain=retain)
+                continue
+            if flat_values is not None:
+                if flat_topic in flat_values and flat_values[flat_topic] == value:
+                    continue
+                flat_values[flat_topic] = value
+            publish(flat_topic, value, retain=retain)
+
     def _publish_mqtt(self, equipment, mqtt_json):
         """Publish decoded packet content to MQTT"""
-        # Retain the to-be-published message ?
-        retain = equipment.retain
         # Determine MQTT topic
         topic = equipment.topic
 
         # Is grouping enabled on this sensor
-        if self.CHANNEL_MESSAGE_KEY in mqtt_json.keys():
-            topic += f"/{mqtt_json[self.CHANNEL_MESSAGE_KEY]}"
+        if self.CHANNEL_MESSAGE_KEY in mqtt_json:
+            channel = mqtt_json[self.CHANNEL_MESSAGE_KEY]
+            # Build the channel topic once and reuse it for next messages
+            if (topic := equipment.channel_topics.get(channel)) is None:
+                topic = f"{equipment.topic}/{channel}"
+                equipment.channel_topics[channel] = topic
             # del mqtt_json[self.CHANNEL_MESSAGE_KEY]
 
         # Publish packet data to MQTT
-        self.logger.debug(f"{topic}: Sent MQTT: {mqtt_json}")
-        self.mqtt_publish(topic, mqtt_json, retain=retain)
-        if equipment.publish_flat:
-            for prop_name, value in mqtt_json.items():
-                prop_name = prop_name.replace(
-                    "/", ""
-                )  # Avoid sub topic if property has / ex: "I/O"
-                self.mqtt_publish(f"{topic}/{prop_name}", value, retain=retain)
+        for publish in equipment.publishers:
+            publish(equipment, topic, mqtt_json)
 
     def _parse_esp_packet(self, packet, equipment):
         """interpret packet, read properties and publish to MQTT"""
@@ -391,7 +551,7 @@ class Gateway:
             message_fields = self._handle_esp_data_packet(packet, equipment)
             if not message_fields:
                 self.logger.warning(
-                    f"message not interpretable: {equipment.name} {packet}"
+                    "message not interpretable: %s %s", equipment.name, packet
                 )
             else:
                 # Store receive date
@@ -403,10 +563,10 @@ class Gateway:
                         message_fields[self.RSSI_MESSAGE_KEY] = packet.dBm
                     except AttributeError:
                         self.logger.warning(
-                            f"Unable to set RSSI value in packet {packet}"
+                            "Unable to set RSSI value in packet %s", packet
                         )
                 message_fields[self.RORG_MESSAGE_KEY] = packet.rorg
-                self.logger.debug(f"Publish message {message_fields}")
+                self.logger.debug("Publish message %s", message_fields)
                 self._publish_mqtt(equipment, message_fields)
         elif packet.learn and not self.enocean.teach_in:
             self.logger.info("Received teach-in packet but learn is not enabled")
@@ -415,10 +575,10 @@ class Gateway:
             self.logger.info("learn request not emitted to mqtt")
 
     def _handle_esp_data_packet(self, packet, equipment):
-        # data packet received
-        if packet.packet_type == PacketType.RADIO and packet.rorg == equipment.rorg:
+        # data packet received, only radio packets are dispatched here
+        if packet.rorg == equipment.rorg:
             # radio packet of proper rorg type received; parse EEP
-            self.logger.debug(f"handle radio packet for sensor {equipment}")
+            self.logger.debug("handle radio packet for sensor %s", equipment)
             fields = equipment.get_packet_fields(packet, direction=equipment.direction)
             properties = packet.parse_message(fields)
             # self.logger.debug(f"found properties in message: {properties}")
@@ -432,88 +592,64 @@ class Gateway:
         return: dict() with formatted fields and units
         """
         message_payload = dict()
-        value_fields = list()
-        operator_fields = list()
-        unit_fields = list()
-        # Define the key that should be used in field to compose json message
-        if equipment.publish_raw or self.publish_raw:
-            # Message format must be published as raw (<shortcut>: <raw_value>)
-            property_key, value_key = (FieldSetName.SHORTCUT, FieldSetName.RAW_VALUE)
-        elif equipment.use_key_shortcut or self.use_key_shortcut:
-            # Message format must be published with field shortcut (<shortcut>: <value>)
-            property_key, value_key = (FieldSetName.SHORTCUT, FieldSetName.VALUE)
-        else:
-            # Message format must be published with field description (<description>: <value>) /!\ Might be verbose
-            property_key, value_key = (FieldSetName.DESCRIPTION, FieldSetName.VALUE)
+        # Key that should be used in field to compose json message, resolved at equipment setup
+        property_key, value_key = equipment.fmt_keys
+        # Bind attributes read for each field to locals
+        channel = equipment.channel
+        channel_key = self.CHANNEL_MESSAGE_KEY
+        unit_keys = self._unit_keys
+        unsupported_field = FieldSetName.UNSUPPORTED
+        unit_field = FieldSetName.UNIT
+        shortcut_field = FieldSetName.SHORTCUT
+        value_field = FieldSetName.VALUE
         # loop through all EEP properties
         for prop in parsed_message:
-            # Remove not supported fields # TODO: might be improve
-            if (
-                isinstance(prop[FieldSetName.VALUE], str)
-                and "not supported" in prop[FieldSetName.VALUE]
-            ):
+            # Remove not supported fields, flagged by the EEP parser
+            if prop.get(unsupported_field):
                 continue
-            # Manage to calculate value before send
-            if prop[FieldSetName.TYPE] == DataFieldType.VALUE:
-                value_fields.append(prop)
-            elif prop[FieldSetName.SHORTCUT] in (
-                SpecificShortcut.MULTIPLIER,
-                SpecificShortcut.DIVISOR,
-            ):
-                operator_fields.append(prop)
-            elif prop[FieldSetName.SHORTCUT] == SpecificShortcut.UNIT:
-                unit_fields.append(prop)
             key = prop[property_key]
             val = prop[value_key]
             message_payload[key] = val
             # Add unit of value fields
-            if unit := prop.get(FieldSetName.UNIT):
-                message_payload[f"{key}|unit"] = unit
+            if unit := prop.get(unit_field):
+                if (unit_key := unit_keys.get(key)) is None:
+                    unit_key = unit_keys[key] = f"{key}{self.UNIT_MESSAGE_KEY_SUFFIX}"
+                message_payload[unit_key] = unit
             # Set specific channel is set for this equipment and set it as internal value
-            if prop[FieldSetName.SHORTCUT] == equipment.channel:
-                message_payload[self.CHANNEL_MESSAGE_KEY] = prop[FieldSetName.VALUE]
+            if prop[shortcut_field] == channel:
+                message_payload[channel_key] = prop[value_field]
         return message_payload
 
     def _reply_packet(self, in_packet, equipment):
         """send enocean message as a reply to an incoming message"""
         # prepare addresses
         # destination = in_packet.sender
-        self._send_packet_to_esp(
-            equipment,
-            data=equipment.answer,
-            command=None,
-            negate_direction=True,
-            learn_data=in_packet.data if in_packet.learn else None,
-        )
+        if in_packet.learn:
+            self._send_learn_reply(equipment, in_packet.data)
+        else:
+            self._send_packet_to_esp(
+                equipment, data=equipment.answer, negate_direction=True
+            )
 
-    def _send_packet_to_esp(
-        self,
-        equipment,
-        data=None,
-        command=None,
-        negate_direction=False,
-        learn_data=None,
+    def _create_packet(
+        self, equipment, command=None, negate_direction=False, learn=False
     ):
-        """triggers sending of an enocean packet"""
+        """create the enocean radio packet to send to the equipment"""
         # determine direction indicator
-        self.logger.info(f"send packet to device {equipment.name} {equipment.address}")
+        self.logger.info(
+            "send packet to device %s %s", equipment.name, equipment.address
+        )
         direction = equipment.direction
         if negate_direction:
             # we invert the direction in this reply
             direction = 1 if direction == 2 else 2
         else:
             direction = None
-        # is this a response to a learn packet?
-        is_learn = learn_data is not None
 
         # Add possibility for the user to indicate a specific sender address
         # in sensor configuration using added 'sender' field.
         # So use specified sender address if any
-        sender = (
-            enocean.utils.address_to_bytes_list(equipment.sender)
-            if equipment.sender
-            else self.controller_address
-        )
+        sender = equipment.sender_bytes or self.controller_address
 
         try:
             packet = RadioPacket.create_message(
@@ -521,60 +657,84 @@ class Gateway:
                 direction=direction,
                 command=command,
                 sender=sender,
-                learn=is_learn,
+                learn=learn,
             )
-            self.logger.debug(f"Packet built: {packet.data}")
+            self.logger.debug("Packet built: %s", packet.data)
+            return packet
         except ValueError as err:
-            self.logger.error(f"cannot create RF packet: {err}")
+            self.logger.error("cannot create RF packet: %s", err)
+
+    def _send_learn_reply(self, equipment, learn_data):
+        """triggers sending of an enocean packet acknowledging a learn request"""
+        packet = self._create_packet(equipment, negate_direction=True, learn=True)
+        if packet is None:
             return
+        # copy EEP and manufacturer ID
+        packet.data[1:5] = learn_data[1:5]
+        # update flags to acknowledge learn request
+        packet.data[4] = 0xF0
+        self.enocean.send(packet)
 
-        # assemble data based on packet type (learn / data)
-        if is_learn:
-            # learn request received
-            # copy EEP and manufacturer ID
-            packet.data[1:5] = learn_data[1:5]
-            # update flags to acknowledge learn request
-            packet.data[4] = 0xF0
+    def _send_packet_to_esp(
+        self,
+        equipment,
+        data=None,
+        command=None,
+        negate_direction=False,
+    ):
+        """triggers sending of an enocean data packet"""
+        packet = self._create_packet(
+            equipment, command=command, negate_direction=negate_direction
+        )
+        if packet is None:
+            return
+        # start with default data
+        # Initialize packet with default_data if specified
+        if equipment.default_data_bytes is not None:
+            packet.data[1:5] = equipment.default_data_bytes
+        # do we have specific data to send?
+        if data:
+            # override with specific data settings
+            self.logger.debug("packet with message %s", packet.message)
+            packet = packet.build_message(data)
         else:
-            # data packet received
-            # start with default data
-            # Initialize packet with default_data if specified
-            if equipment.default_data:
-                packet.data[1:5] = [
-                    (equipment.default_data >> i * 8) & 0xFF for i in reversed(range(4))
-                ]
-            # do we have specific data to send?
-            if data:
-                # override with specific data settings
-                self.logger.debug(f"packet with message {packet.message}")
-                packet = packet.build_message(data)
-            else:
-                # what to do if we have no data to send yet?
-                self.logger.warning(
-                    "sending only default data as answer to %s", equipment.name
-                )
+            # what to do if we have no data to send yet?
+            self.logger.warning(
+                "sending only default data as answer to %s", equipment.name
+            )
         self.enocean.send(packet)
 
     def _process_radio_packet(self, packet):
         # first, look whether we have this sensor configured
-        sender_address = enocean.utils.combine_hex(packet.sender)
-        formatted_address = enocean.utils.to_hex_string(sender_address)
-        self.logger.debug(f"process radio for address {formatted_address}")
-        if formatted_address not in self.detected_equipments:
-            self.detected_equipments.add(formatted_address)
-            self.logger.info(f"Detected new equipment with address {formatted_address}")
-            # self.mqtt_publish(f"{self.topic_prefix}gateway/detected_equipments", list(self.detected_equipments))
-        self.logger.debug(f"received: {packet}")
-        equipment = self.get_equipment(sender_address)
+        # Radio packet sender is always 4 bytes long, combine them inline
+        s = packet.sender
+        sender_address = (s[0] << 24) | (s[1] << 16) | (s[2] << 8) | s[3]
+        # Address is formatted as hex by the logger only if the record is emitted
+        self.logger.debug("process radio for address %02X", sender_address)
+        known_state = self._known_state
+        equipment = known_state.get(sender_address, _SENTINEL)
+        if equipment is _SENTINEL:
+            equipment = self.equipments.get(sender_address)
+            if equipment is None and len(known_state) >= self.MAX_DETECTED_EQUIPMENTS:
+                # Forget the oldest unknown address to bound memory on noisy RF
+                # environments, configured equipments are never evicted
+                for address, state in known_state.items():
+                    if state is None:
+                        del known_state[address]
+                        break
+            known_state[sender_address] = equipment
+            self.logger.info("Detected new equipment with address %02X", sender_address)
+            # self.mqtt_publish(f"{self.topic_prefix}gateway/detected_equipments", list(self._known_state))
+        self.logger.debug("received: %s", packet)
         if not equipment:
             # skip unknown sensor
             self.logger.info(
-                f"unknown sender id {formatted_address}, telegram disregarded"
+                "unknown sender id %02X, telegram disregarded", sender_address
             )
             return
         elif equipment.ignore:
             # skip ignored sensors
-            self.logger.debug(f"ignored sensor: {formatted_address}")
+            self.logger.debug("ignored sensor: %02X", sender_address)
             return
 
         # Handling EnOcean library decision to set learn to False by default.
@@ -595,51 +755,98 @@ class Gateway:
 
     def _cleanup_mqtt(self):
         if self.publish_internal:
-            self.mqtt_publish(
-                f"{self.topic_prefix}{self.GATEWAY_STATUS_TOPIC}",
-                "OFFLINE",
-                retain=True,
-            )
+            self.mqtt_publish(self._status_topic, self.OFFLINE_PAYLOAD, retain=True)
         self.mqtt_client.disconnect()
         self.mqtt_client.loop_stop()
+        # Stop MQTT worker once no more message can be received
+        self._mqtt_inbound.put(None)
 
     # =============================================================================================
     # RUN LOOP
     # =============================================================================================
+    def _process_response_packet(self, packet):
+        response_code = ReturnCode(packet.data[0])
+        self.logger.info("got esp response packet: %s", response_code.name)
+        if self.publish_response_status:
+            self.mqtt_publish_buffered(self._rep_topic, response_code.name)
+
+    def _process_event_packet(self, packet):
+        try:
+            event = EventCode(packet.event).name
+        except ValueError:
+            event = packet.event
+        self.logger.info("got esp event packet: %s", event)
+
+    def _handle_packet(self, packet):
+        # dispatch packet based on its type
+        if handler := self._packet_handlers.get(packet.packet_type):
+            handler(packet)
+        else:
+            self.logger.info(
+                "got unsupported packet: type=%s %s", packet.packet_type, packet
+            )
+
+    def _shutdown(self, signum, frame):
+        """signal handler stopping the main loop"""
+        self.logger.debug("Received signal %s, stopping", signum)
+        # Restore default handlers so that a second signal always stops the process
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        # Only set the controller stop flag, taking the receive queue lock here could
+        # deadlock. The controller thread posts None to the queue once stopped.
+        self.enocean.stop()
+        if not self.enocean.is_alive():
+            # Controller thread is already gone, stop the main loop directly
+            raise KeyboardInterrupt
+
     def run(self):
         """the main loop with blocking enocean packet receive handler"""
-        # start endless loop for listening
-        while self.enocean.is_alive():
-            # Loop to empty the queue...
-            try:
+        signal.signal(signal.SIGINT, self._shutdown)
+        signal.signal(signal.SIGTERM, self._shutdown)
+        # Bind attributes used for each packet to locals
+        receive = self.enocean.receive
+        handle_packet = self._handle_packet
+        flush_mqtt_publish = self.flush_mqtt_publish
+        # Blocking lock wait can't be interrupted on Windows, so signal handler
+        # is only run on timeout
+        timeout = 1 if platform.system() == "Windows" else None
+        # start endless loop for listening, None is posted on shutdown
+        try:
+            while self.enocean.is_alive():
+                # publish buffered messages before waiting for next packet
+                if receive.empty():
+                    flush_mqtt_publish()
                 # get next packet
-                if platform.system() == "Windows":
-                    # only timeout on Windows for KeyboardInterrupt checking
-                    packet = self.enocean.receive.get(block=True, timeout=1)
-                else:
-                    packet = self.enocean.receive.get(block=True)
-                # check packet type
-                if packet.packet_type == PacketType.RADIO:
-                    self._process_radio_packet(packet)
-                elif packet.packet_type == PacketType.RESPONSE:
-                    response_code = ReturnCode(packet.data[0])
-                    self.logger.info(f"got esp response packet: {response_code.name}")
-                    if self.publish_response_status:
-                        self.mqtt_publish(f"{self.topic_prefix}rep", response_code.name)
-                else:
-                    self.logger.info(
-                        f"got unsupported packet: type={packet.packet_type} {packet}"
-                    )
+                try:
+                    packet = receive.get(block=True, timeout=timeout)
+                except queue.Empty:
                     continue
-            except queue.Empty:
-                continue
-            except KeyboardInterrupt:
-                logging.debug("Exception: KeyboardInterrupt")
-                break
+                if packet is None:
+                    break
+                # drain packets already received to handle them as a batch
+                packets = [packet]
+                stopping = False
+                for _ in range(self.RECEIVE_BATCH_SIZE - 1):
+                    try:
+                        packet = receive.get_nowait()
+                    except queue.Empty:
+                        break
+                    if packet is None:
+                        stopping = True
+                        break
+                    packets.append(packet)
+                for packet in packets:
+                    handle_packet(packet)
+                if stopping:
+                    # packets received before shutdown are handled, stop
+                    break
+        except KeyboardInterrupt:
+            self.logger.debug("Main loop interrupted")
         # Run finished, close MQTT client and stop Enocean thread
         self.logger.info(
             f"Close the enocean controller, get {self.enocean.crc_errors} crc errors during run"
         )
         self.logger.debug("Cleaning up")
         self.enocean.stop()
+        self.flush_mqtt_publish()
         self._cleanup_mqtt()